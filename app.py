@@ -3,13 +3,28 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from dotenv import load_dotenv
+from sqlalchemy import case, func, insert
+from sqlalchemy.engine import make_url
 import joblib
-import pandas as pd
 import numpy as np
-from datetime import datetime
+import orjson
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+try:
+    import tl2cgen
+except ImportError:
+    tl2cgen = None
+from datetime import datetime, timedelta
+import atexit
 import hashlib
+import logging
+import logging.handlers
 import os
-from functools import wraps
+import queue
+import threading
+from functools import lru_cache, wraps
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -24,16 +39,65 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_pre_ping': True,
     'pool_recycle': 300,
 }
+database_url = make_url(app.config['SQLALCHEMY_DATABASE_URI']) if app.config['SQLALCHEMY_DATABASE_URI'] else None
+if database_url is not None and database_url.get_backend_name() == 'postgresql':
+    # Pool LIFO : la dernière connexion rendue (encore chaude) est réutilisée en
+    # premier, les connexions en surplus restent inactives et expirent plus vite
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+        'pool_use_lifo': True,
+        'pool_size': 5,
+        'max_overflow': 10,
+    })
+    # INSERT multi-lignes (VALUES (...), (...)) et execute_batch pour les executemany
+    if database_url.get_driver_name() == 'psycopg2':
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+            'executemany_mode': 'values_plus_batch',
+            'insertmanyvalues_page_size': 1000,
+        })
 
 db = SQLAlchemy(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Journalisation asynchrone : les requêtes déposent les messages dans une file,
+# un thread dédié les écrit sur stderr.
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+log_listener = None
+
+
+def start_log_listener():
+    """Démarre le thread d'écriture des logs du processus courant."""
+    global log_listener
+    if log_listener is not None:
+        # Copie héritée du parent après un fork : son thread n'existe pas ici
+        atexit.unregister(log_listener.stop)
+    log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+
+start_log_listener()
+# gunicorn --preload : chaque worker forké relance son propre thread
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=start_log_listener)
+
+log = logging.getLogger('fraud')
+log.addHandler(logging.handlers.QueueHandler(log_queue))
+log.setLevel(logging.INFO)
+log.propagate = False
+
 # ==============================
 # 📊 MODÈLES DE BASE DE DONNÉES
 # ==============================
 
+def hash_password(password):
+    """Empreinte d'un mot de passe (format Werkzeug)."""
+    return generate_password_hash(password)
+
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -44,7 +108,7 @@ class User(UserMixin, db.Model):
     transactions = db.relationship('Transaction', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -74,6 +138,13 @@ class Transaction(db.Model):
     fraud_prediction = db.Column(db.Integer)
     fraud_probability = db.Column(db.Float)
     risk_level = db.Column(db.String(20))
+
+    # Index couvrant l'historique paginé et les agrégations de /api/stats
+    __table_args__ = (
+        db.Index('ix_tx_user_time', 'user_id', timestamp.desc()),
+        db.Index('ix_tx_user_country', 'user_id', 'transaction_country'),
+        db.Index('ix_tx_user_fraud', 'user_id', 'fraud_prediction'),
+    )
     
     def to_dict(self):
         return {
@@ -111,28 +182,200 @@ def admin_required(f):
 # 🔹 FONCTION UTILITAIRE
 # ==============================
 
+def json_response(payload, status=200):
+    """Réponse JSON sérialisée avec orjson (UTF-8 direct, datetime natif)."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+
+# Buckets des valeurs fréquentes (codes pays, devises...), les plus anciennes sont évincées
+@lru_cache(maxsize=4096)
+def _hash_str(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big') % 1000
+
+
 def stable_hash(value):
     """Encodage stable pour les variables catégorielles."""
     if isinstance(value, str):
-        return int(hashlib.sha256(value.encode()).hexdigest(), 16) % 1000
+        return _hash_str(value)
     return 0
 
 
+# Valeurs de Gender encodées comme « homme »
+MALE_VALUES = frozenset({'M', 'MALE', 'HOMME'})
+
+
+def encode_gender(value):
+    """1 pour un homme, 0 sinon."""
+    return 1.0 if str(value).upper() in MALE_VALUES else 0.0
+
+
+def encode_category(value):
+    """Bucket stable d'une variable catégorielle."""
+    return _hash_str(str(value))
+
+
+# Variables d'entrée dans l'ordre attendu par le scaler, avec leur encodage
+FEATURES = (
+    ('Gender', encode_gender),
+    ('Age', float),
+    ('HouseTypeID', int),
+    ('ContactAvaliabilityID', int),
+    ('HomeCountry', encode_category),
+    ('AccountNo', int),
+    ('CardExpiryDate', int),
+    ('TransactionAmount', float),
+    ('TransactionCountry', encode_category),
+    ('LargePurchase', int),
+    ('ProductID', int),
+    ('CIF', int),
+    ('TransactionCurrencyCode', encode_category),
+)
+N_FEATURES = len(FEATURES)
+
+# Champs obligatoires pour /api/predict
+REQUIRED_FIELDS = frozenset(field for field, _ in FEATURES)
+
+# Précision des entrées et de la normalisation (celle de l'entraînement) ;
+# seul le résultat normalisé est converti en float32 pour les arbres de sklearn
+FEATURE_DTYPE = np.float64
+MODEL_DTYPE = np.float32
+
+# Niveaux de risque indexés par le nombre de seuils (0.4, 0.7) atteints
+RISK_LEVELS = ("Faible", "Modéré", "Élevé")
+_RISK_LEVELS_ARRAY = np.array(RISK_LEVELS)
+
+# Taille maximale d'un lot pour /api/predict_batch
+MAX_BATCH_SIZE = 1000
+
+_local = threading.local()
+
+
+def feature_buffer():
+    """Tampon (1, N_FEATURES) préalloué, propre à chaque thread."""
+    buf = getattr(_local, 'features', None)
+    if buf is None:
+        buf = _local.features = np.empty((1, N_FEATURES), dtype=FEATURE_DTYPE)
+    return buf
+
+
+def missing_fields(data):
+    """Retourne l'ensemble des champs obligatoires absents ou vides."""
+    missing = REQUIRED_FIELDS - data.keys()
+    if not missing:
+        missing = {f for f in REQUIRED_FIELDS if data[f] in (None, "")}
+    return missing
+
+
+def encode_features(data, row):
+    """Remplit `row` (vecteur de N_FEATURES valeurs) à partir d'une transaction."""
+    for i, (field, encode) in enumerate(FEATURES):
+        row[i] = encode(data[field])
+
+
+def encode_batch(items):
+    """Matrice (n, N_FEATURES) remplie colonne par colonne pour un lot de transactions."""
+    n = len(items)
+    X = np.empty((n, N_FEATURES), dtype=FEATURE_DTYPE)
+    for i, (field, encode) in enumerate(FEATURES):
+        X[:, i] = np.fromiter((encode(data[field]) for data in items), dtype=FEATURE_DTYPE, count=n)
+    return X
+
+
+def transaction_fields(data):
+    """Colonnes de Transaction issues des données brutes de la requête."""
+    return {
+        'gender': data['Gender'],
+        'age': data['Age'],
+        'house_type_id': data['HouseTypeID'],
+        'contact_availability_id': data['ContactAvaliabilityID'],
+        'home_country': data['HomeCountry'],
+        'account_no': str(data['AccountNo']),
+        'card_expiry_date': str(data['CardExpiryDate']),
+        'transaction_amount': data['TransactionAmount'],
+        'transaction_country': data['TransactionCountry'],
+        'large_purchase': data['LargePurchase'],
+        'product_id': data['ProductID'],
+        'cif': str(data['CIF']),
+        'transaction_currency_code': data['TransactionCurrencyCode'],
+    }
+
+
+def prediction_result(transaction_id, timestamp, prediction, probability, risk):
+    """Corps de réponse d'une prédiction."""
+    return {
+        "id": transaction_id,
+        "timestamp": timestamp,
+        "fraud_prediction": prediction,
+        "fraud_probability": probability,
+        "risk_level": risk,
+        "status": "FRAUDE DÉTECTÉE" if prediction == 1 else "Transaction légitime",
+        "confidence": f"{probability*100:.1f}%"
+    }
+
+
 # ==============================
 # 🔹 CHARGEMENT DU MODÈLE
 # ==============================
 
 MODEL_PATH = os.getenv('MODEL_PATH', 'models/best_fraud_detection_model_20251031_2007.pkl')
 SCALER_PATH = os.getenv('SCALER_PATH', 'models/scaler.pkl')
+ONNX_PATH = os.getenv('ONNX_PATH', 'models/fraud_model.onnx')
+TREELITE_PATH = os.getenv('TREELITE_PATH', 'models/fraud_model.so')
 
 try:
+    # Chargé avant le fork avec gunicorn --preload : les workers partagent les
+    # tableaux des arbres en copie sur écriture (ils ne sont jamais modifiés)
     model = joblib.load(MODEL_PATH)
     scaler = joblib.load(SCALER_PATH)
-    print("✅ Modèle et scaler chargés avec succès.")
+    # Le scaler a été ajusté sur un DataFrame mais reçoit désormais un ndarray :
+    # on retire les noms de colonnes pour éviter l'avertissement de sklearn.
+    if hasattr(scaler, 'feature_names_in_'):
+        del scaler.feature_names_in_
+    log.info("✅ Modèle et scaler chargés avec succès.")
 except Exception as e:
-    print(f"❌ Erreur lors du chargement : {e}")
+    log.error("❌ Erreur lors du chargement : %s", e)
     model, scaler = None, None
 
+# Colonne de la classe « fraude » dans predict_proba, calculée une seule fois
+INDEX_FRAUD = int(np.where(model.classes_ == 1)[0][0]) if model is not None and 1 in model.classes_.tolist() else 1
+
+# Arbres compilés par export_model.py treelite (optionnel)
+treelite_predictor = None
+if tl2cgen is not None and model is not None and os.path.exists(TREELITE_PATH):
+    try:
+        treelite_predictor = tl2cgen.Predictor(TREELITE_PATH, nthread=1)
+        log.info("✅ Modèle Treelite chargé, inférence compilée.")
+    except Exception as e:
+        log.error("❌ Erreur lors du chargement Treelite : %s", e)
+        treelite_predictor = None
+
+# Modèle exporté par export_model.py onnx (optionnel)
+onnx_session = None
+if treelite_predictor is None and ort is not None and model is not None and os.path.exists(ONNX_PATH):
+    try:
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1  # un thread par worker gunicorn
+        onnx_session = ort.InferenceSession(ONNX_PATH, options, providers=['CPUExecutionProvider'])
+        onnx_input = onnx_session.get_inputs()[0].name
+        onnx_probas = onnx_session.get_outputs()[1].name
+        log.info("✅ Modèle ONNX chargé, inférence via ONNX Runtime.")
+    except Exception as e:
+        log.error("❌ Erreur lors du chargement ONNX : %s", e)
+        onnx_session = None
+
+
+def predict_probas(X):
+    """Probabilités par classe pour un lot de lignes non normalisées."""
+    # Les arbres de sklearn travaillent en float32 ligne par ligne : on leur
+    # fournit directement un tableau C-contigu pour éviter une copie interne.
+    X_scaled = np.ascontiguousarray(scaler.transform(X), dtype=MODEL_DTYPE)
+    if onnx_session is not None:
+        return onnx_session.run([onnx_probas], {onnx_input: X_scaled})[0]
+    if treelite_predictor is not None:
+        # Sortie (n, 1, classes) pour un classifieur sklearn importé
+        return treelite_predictor.predict(tl2cgen.DMatrix(X_scaled)).reshape(len(X_scaled), -1)
+    return model.predict_proba(X_scaled)
+
 
 # ==============================
 # 🌐 ROUTES D'AUTHENTIFICATION
@@ -246,45 +489,49 @@ def history():
 @app.route('/api/stats')
 @login_required
 def get_stats():
-    user_transactions = Transaction.query.filter_by(user_id=current_user.id).all()
-    
-    total = len(user_transactions)
-    frauds = sum(1 for t in user_transactions if t.fraud_prediction == 1)
+    user_filter = Transaction.user_id == current_user.id
+    is_fraud = case((Transaction.fraud_prediction == 1, 1), else_=0)
+    tx_count = func.count(Transaction.id)
+
+    total, frauds, total_amount, fraud_amount = db.session.query(
+        tx_count,
+        func.sum(is_fraud),
+        func.sum(Transaction.transaction_amount),
+        func.sum(case((Transaction.fraud_prediction == 1, Transaction.transaction_amount), else_=0))
+    ).filter(user_filter).one()
+
+    frauds = int(frauds or 0)
     legitimate = total - frauds
-    
-    total_amount = sum(t.transaction_amount for t in user_transactions)
-    fraud_amount = sum(t.transaction_amount for t in user_transactions if t.fraud_prediction == 1)
-    
-    risk_distribution = {
-        'Élevé': sum(1 for t in user_transactions if t.risk_level == 'Élevé'),
-        'Modéré': sum(1 for t in user_transactions if t.risk_level == 'Modéré'),
-        'Faible': sum(1 for t in user_transactions if t.risk_level == 'Faible')
-    }
-    
+    total_amount = total_amount or 0
+    fraud_amount = fraud_amount or 0
+
+    risk_distribution = {'Élevé': 0, 'Modéré': 0, 'Faible': 0}
+    risk_rows = db.session.query(Transaction.risk_level, tx_count)\
+        .filter(user_filter)\
+        .group_by(Transaction.risk_level)
+    for level, count in risk_rows:
+        if level in risk_distribution:
+            risk_distribution[level] = count
+
     # Transactions par jour (7 derniers jours)
-    from collections import defaultdict
-    daily_transactions = defaultdict(lambda: {'total': 0, 'frauds': 0})
-    
-    for t in user_transactions:
-        date_key = t.timestamp.strftime('%Y-%m-%d')
-        daily_transactions[date_key]['total'] += 1
-        if t.fraud_prediction == 1:
-            daily_transactions[date_key]['frauds'] += 1
-    
+    day = func.date(Transaction.timestamp)
+    daily_rows = db.session.query(day, tx_count, func.sum(is_fraud))\
+        .filter(user_filter, Transaction.timestamp >= datetime.utcnow() - timedelta(days=7))\
+        .group_by(day)
+    daily_transactions = {
+        str(date_key): {'total': count, 'frauds': int(fraud_count or 0)}
+        for date_key, count, fraud_count in daily_rows
+    }
+
     # Top 5 pays
-    country_stats = defaultdict(lambda: {'total': 0, 'frauds': 0})
-    for t in user_transactions:
-        country_stats[t.transaction_country]['total'] += 1
-        if t.fraud_prediction == 1:
-            country_stats[t.transaction_country]['frauds'] += 1
-    
-    top_countries = sorted(
-        country_stats.items(),
-        key=lambda x: x[1]['total'],
-        reverse=True
-    )[:5]
-    
-    return jsonify({
+    top_countries = db.session.query(Transaction.transaction_country, tx_count, func.sum(is_fraud))\
+        .filter(user_filter)\
+        .group_by(Transaction.transaction_country)\
+        .order_by(tx_count.desc())\
+        .limit(5)\
+        .all()
+
+    return json_response({
         'overview': {
             'total': total,
             'frauds': frauds,
@@ -294,8 +541,11 @@ def get_stats():
             'fraud_amount': round(fraud_amount, 2)
         },
         'risk_distribution': risk_distribution,
-        'daily_transactions': dict(daily_transactions),
-        'top_countries': [{'country': k, 'stats': v} for k, v in top_countries]
+        'daily_transactions': daily_transactions,
+        'top_countries': [
+            {'country': country, 'stats': {'total': count, 'frauds': int(fraud_count or 0)}}
+            for country, count, fraud_count in top_countries
+        ]
     })
 
 
@@ -309,7 +559,7 @@ def get_transactions():
         .order_by(Transaction.timestamp.desc())\
         .paginate(page=page, per_page=per_page, error_out=False)
     
-    return jsonify({
+    return json_response({
         'transactions': [t.to_dict() for t in transactions.items],
         'total': transactions.total,
         'pages': transactions.pages,
@@ -328,87 +578,106 @@ def predict():
         if model is None or scaler is None:
             return jsonify({'error': 'Modèle non disponible'}), 500
 
-        data = request.get_json()
-        required_fields = [
-            'Gender','Age','HouseTypeID','ContactAvaliabilityID','HomeCountry',
-            'AccountNo','CardExpiryDate','TransactionAmount','TransactionCountry',
-            'LargePurchase','ProductID','CIF','TransactionCurrencyCode'
-        ]
+        data = orjson.loads(request.get_data(cache=False))
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Transaction invalide'}), 400
+        missing = missing_fields(data)
+        if missing:
+            return jsonify({'error': f"Champ manquant : {', '.join(sorted(missing))}"}), 400
+
+        # Préparation des données (rempli en place, sans DataFrame)
+        X = feature_buffer()
+        encode_features(data, X[0])
+
+        probas = predict_probas(X)[0]
+        probability = float(probas[INDEX_FRAUD])
+        prediction = int(probas.argmax())
+
+        risk = RISK_LEVELS[(probability >= 0.4) + (probability >= 0.7)]
+
+        # Enregistrement : un seul INSERT ... RETURNING, sans flush de l'ORM
+        timestamp = datetime.utcnow()
+        transaction_id = db.session.execute(
+            insert(Transaction).values(
+                user_id=current_user.id,
+                timestamp=timestamp,
+                **transaction_fields(data),
+                fraud_prediction=prediction,
+                fraud_probability=probability,
+                risk_level=risk
+            ).returning(Transaction.id)
+        ).scalar_one()
+        db.session.commit()
 
-        for field in required_fields:
-            if field not in data or data[field] in [None, ""]:
-                return jsonify({'error': f'Champ manquant : {field}'}), 400
-
-        # Préparation des données
-        df = pd.DataFrame([{
-            'Gender': 1 if str(data['Gender']).upper() in ['M', 'MALE', 'HOMME'] else 0,
-            'Age': float(data['Age']),
-            'HouseTypeID': int(data['HouseTypeID']),
-            'ContactAvaliabilityID': int(data['ContactAvaliabilityID']),
-            'HomeCountry': stable_hash(str(data['HomeCountry'])),
-            'AccountNo': int(data['AccountNo']),
-            'CardExpiryDate': int(data['CardExpiryDate']),
-            'TransactionAmount': float(data['TransactionAmount']),
-            'TransactionCountry': stable_hash(str(data['TransactionCountry'])),
-            'LargePurchase': int(data['LargePurchase']),
-            'ProductID': int(data['ProductID']),
-            'CIF': int(data['CIF']),
-            'TransactionCurrencyCode': stable_hash(str(data['TransactionCurrencyCode']))
-        }])
-
-        X_scaled = scaler.transform(df)
-        probas = model.predict_proba(X_scaled)[0]
-        classes = model.classes_
-        index_fraud = np.where(classes == 1)[0][0] if 1 in classes else 1
-        probability = float(probas[index_fraud])
-        prediction = int(np.argmax(probas))
-
-        if probability >= 0.7:
-            risk = "Élevé"
-        elif probability >= 0.4:
-            risk = "Modéré"
-        else:
-            risk = "Faible"
-
-        # Enregistrement dans la base de données
-        transaction = Transaction(
-            user_id=current_user.id,
-            gender=data['Gender'],
-            age=data['Age'],
-            house_type_id=data['HouseTypeID'],
-            contact_availability_id=data['ContactAvaliabilityID'],
-            home_country=data['HomeCountry'],
-            account_no=str(data['AccountNo']),
-            card_expiry_date=str(data['CardExpiryDate']),
-            transaction_amount=data['TransactionAmount'],
-            transaction_country=data['TransactionCountry'],
-            large_purchase=data['LargePurchase'],
-            product_id=data['ProductID'],
-            cif=str(data['CIF']),
-            transaction_currency_code=data['TransactionCurrencyCode'],
-            fraud_prediction=prediction,
-            fraud_probability=probability,
-            risk_level=risk
-        )
-        
-        db.session.add(transaction)
+        result = prediction_result(transaction_id, timestamp, prediction, probability, risk)
+
+        log.info("%s - User: %s", result['status'], current_user.username)
+        return json_response(result)
+
+    except Exception as e:
+        db.session.rollback()
+        log.error("❌ Erreur : %s", e)
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/predict_batch', methods=['POST'])
+@login_required
+def predict_batch():
+    try:
+        if model is None or scaler is None:
+            return jsonify({'error': 'Modèle non disponible'}), 500
+
+        payload = orjson.loads(request.get_data(cache=False))
+        items = payload.get('transactions') if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Champ manquant : transactions'}), 400
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Lot trop volumineux (maximum {MAX_BATCH_SIZE} transactions)'}), 400
+
+        for i, data in enumerate(items):
+            if not isinstance(data, dict):
+                return jsonify({'error': f'Transaction {i} invalide'}), 400
+            missing = missing_fields(data)
+            if missing:
+                return jsonify({'error': f"Transaction {i} - Champ manquant : {', '.join(sorted(missing))}"}), 400
+
+        # Encodage colonne par colonne, puis un seul appel au scaler et au modèle
+        X = encode_batch(items)
+        probas = predict_probas(X)
+        probabilities = probas[:, INDEX_FRAUD]
+        predictions = probas.argmax(axis=1)
+        risks = _RISK_LEVELS_ARRAY[(probabilities >= 0.4).astype(np.intp) + (probabilities >= 0.7)]
+
+        # Enregistrement groupé : un seul INSERT multi-lignes
+        timestamp = datetime.utcnow()
+        rows = [
+            {
+                'user_id': current_user.id,
+                'timestamp': timestamp,
+                **transaction_fields(data),
+                'fraud_prediction': int(prediction),
+                'fraud_probability': float(probability),
+                'risk_level': str(risk)
+            }
+            for data, prediction, probability, risk in zip(items, predictions, probabilities, risks)
+        ]
+        ids = db.session.execute(
+            insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
         db.session.commit()
 
-        result = {
-            "id": transaction.id,
-            "timestamp": transaction.timestamp.isoformat(),
-            "fraud_prediction": prediction,
-            "fraud_probability": probability,
-            "risk_level": risk,
-            "status": "🚨 FRAUDE DÉTECTÉE" if prediction == 1 else "✅ Transaction légitime",
-            "confidence": f"{probability*100:.1f}%"
-        }
+        results = [
+            prediction_result(tx_id, timestamp, row['fraud_prediction'], row['fraud_probability'], row['risk_level'])
+            for tx_id, row in zip(ids, rows)
+        ]
 
-        print(f"[INFO] {result['status']} - User: {current_user.username}")
-        return jsonify(result)
+        log.info("Lot de %d transactions analysé - User: %s", len(results), current_user.username)
+        return json_response({'transactions': results})
 
     except Exception as e:
-        print(f"❌ Erreur : {e}")
+        db.session.rollback()
+        log.error("❌ Erreur : %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -432,14 +701,17 @@ def models_evaluation():
     return render_template('models_evaluation.html')
 
 
+# Le modèle et le scaler ne changent pas après le démarrage : réponse figée
+HEALTH_BODY = orjson.dumps({
+    'status': 'healthy' if model and scaler else 'unhealthy',
+    'model_loaded': model is not None,
+    'scaler_loaded': scaler is not None
+})
+
+
 @app.route('/api/health')
 def health():
-    return jsonify({
-        'status': 'healthy' if model and scaler else 'unhealthy',
-        'model_loaded': model is not None,
-        'scaler_loaded': scaler is not None,
-        'timestamp': datetime.now().isoformat()
-    })
+    return app.response_class(HEALTH_BODY, mimetype='application/json')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
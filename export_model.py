@@ -0,0 +1,123 @@
+"""
+Script d'export du modèle de prédiction vers des formats compilés
+Produit le modèle ONNX et/ou la bibliothèque Treelite servis par app.py
+"""
+
+from dotenv import load_dotenv
+import sys
+import os
+
+# Charger les variables d'environnement
+load_dotenv()
+
+import joblib
+import numpy as np
+
+MODEL_PATH = os.getenv('MODEL_PATH', 'models/best_fraud_detection_model_20251031_2007.pkl')
+SCALER_PATH = os.getenv('SCALER_PATH', 'models/scaler.pkl')
+ONNX_PATH = os.getenv('ONNX_PATH', 'models/fraud_model.onnx')
+TREELITE_PATH = os.getenv('TREELITE_PATH', 'models/fraud_model.so')
+
+
+def load_artifacts():
+    """Charge le modèle et le scaler entraînés"""
+    try:
+        return joblib.load(MODEL_PATH), joblib.load(SCALER_PATH)
+    except Exception as e:
+        print(f"❌ Erreur lors du chargement : {e}")
+        return None, None
+
+
+def export_onnx():
+    """Exporte le modèle vers ONNX_PATH"""
+    try:
+        from skl2onnx import to_onnx
+    except ImportError:
+        print("❌ skl2onnx n'est pas installé : pip install -r requirements-optional.txt")
+        return False
+
+    model, _ = load_artifacts()
+    if model is None:
+        return False
+
+    print("🔄 Conversion du modèle en ONNX...")
+    try:
+        # Seul le modèle est exporté : la normalisation reste faite en float64 par le
+        # scaler (AccountNo et CIF perdent de la précision en float32 avant normalisation)
+        sample = np.zeros((1, model.n_features_in_), dtype=np.float32)
+        # zipmap désactivé : les probabilités sortent sous forme de tenseur (n, classes)
+        onnx_model = to_onnx(model, sample, options={id(model): {'zipmap': False}})
+        with open(ONNX_PATH, 'wb') as f:
+            f.write(onnx_model.SerializeToString())
+    except Exception as e:
+        print(f"❌ Erreur lors de la conversion : {e}")
+        return False
+
+    print(f"✅ Modèle exporté : {ONNX_PATH}")
+    return True
+
+
+def export_treelite():
+    """Compile les arbres du modèle en bibliothèque partagée (TREELITE_PATH)"""
+    try:
+        import treelite
+        import tl2cgen
+    except ImportError:
+        print("❌ treelite/tl2cgen ne sont pas installés : pip install -r requirements-optional.txt")
+        return False
+
+    model, _ = load_artifacts()
+    if model is None:
+        return False
+
+    print("🔄 Compilation du modèle avec Treelite...")
+    try:
+        # Seul le modèle est compilé : la normalisation reste faite par le scaler
+        tl_model = treelite.sklearn.import_model(model)
+        tl2cgen.export_lib(
+            tl_model,
+            toolchain='gcc',
+            libpath=TREELITE_PATH,
+            params={'parallel_comp': 32, 'quantize': 1}
+        )
+    except Exception as e:
+        print(f"❌ Erreur lors de la compilation : {e}")
+        return False
+
+    print(f"✅ Bibliothèque compilée : {TREELITE_PATH}")
+    return True
+
+
+def show_help():
+    """Affiche l'aide"""
+    print("\n   Commandes disponibles :")
+    print("\n   onnx          - Exporte le modèle en ONNX")
+    print("   treelite      - Compile le modèle avec Treelite (gcc requis)")
+    print("   all           - Les deux exports")
+    print("\n   📋 Exemple : python export_model.py onnx")
+
+
+if __name__ == '__main__':
+    print("="*60)
+    print("   📦 EXPORT DU MODÈLE DE PRÉDICTION")
+    print("="*60)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'onnx'
+
+    if command == 'onnx':
+        ok = export_onnx()
+    elif command == 'treelite':
+        ok = export_treelite()
+    elif command == 'all':
+        ok = export_onnx() & export_treelite()
+    elif command in ('help', '--help', '-h'):
+        show_help()
+        sys.exit(0)
+    else:
+        print(f"\n❌ Commande inconnue : '{command}'")
+        show_help()
+        sys.exit(1)
+
+    if not ok:
+        sys.exit(1)
+    print("\n💡 Redémarrez l'application pour utiliser le modèle exporté")
@@ -10,169 +10,413 @@ import os
 # Charger les variables d'environnement
 load_dotenv()
 
-# Importer après load_dotenv pour s'assurer que les variables sont chargées
-from app import app, db, User
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import io
+from datetime import datetime
+from functools import wraps
 
+# Commandes qui nécessitent l'application (et donc la base de données)
+DB_COMMANDS = ('init', 'reset', 'create-users', 'stats', 'check')
+
+# Taille des paquets pour l'insertion en masse (sweet spot PostgreSQL)
+BATCH_SIZE = 10000
+
+# Au-delà, les utilisateurs créés ne sont plus listés un par un
+MAX_LISTED = 10
+
+# Connexion déjà vérifiée pendant cette exécution
+_conn_checked = False
+
+# Application Flask, modèles et SQLAlchemy : importés à la demande par _load_app()
+app = None
+
+ADMIN_USER = {'username': 'admin', 'email': 'admin@fraud-detection.com', 'password': 'admin123', 'role': 'admin'}
+
+TEST_USERS = [
+    {'username': 'user1', 'email': 'user1@test.com', 'password': 'password123', 'role': 'user'},
+    {'username': 'user2', 'email': 'user2@test.com', 'password': 'password123', 'role': 'user'},
+    {'username': 'analyst', 'email': 'analyst@test.com', 'password': 'password123', 'role': 'user'},
+]
+
+
+def _load_app():
+    """Importe l'application et SQLAlchemy une seule fois (Flask et le modèle ML ne
+    sont chargés que par les commandes qui touchent à la base)"""
+    global app, db, User, hash_password, ADMIN_EXISTS
+    global ARRAY, Numeric, String, any_, bindparam, case, func, insert, literal_column, select, text
+    if app is not None:
+        return app
+    
+    from app import app as flask_app, db, User, hash_password
+    from sqlalchemy import (
+        ARRAY, Numeric, String, any_, bindparam, case, func, insert, literal_column, select, text
+    )
+    
+    # Requêtes construites une seule fois : leur forme compilée est mise en cache par SQLAlchemy
+    ADMIN_EXISTS = select(User.id).where(User.role == 'admin').limit(1)
+    
+    app = flask_app
+    return app
+
+
+def with_app(f):
+    """Exécute `f` dans un contexte applicatif (réutilise celui déjà actif)"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        from flask import has_app_context
+        
+        flask_app = _load_app()
+        if has_app_context():
+            return f(*args, **kwargs)
+        with flask_app.app_context():
+            return f(*args, **kwargs)
+    return wrapper
+
+
+@with_app
+def schema_exists():
+    """Vérifie en une requête que toutes les tables existent (PostgreSQL)"""
+    if db.engine.dialect.name != 'postgresql':
+        return False
+    preparer = db.engine.dialect.identifier_preparer
+    row = db.session.execute(select(*[
+        func.to_regclass(preparer.format_table(table)) for table in db.metadata.sorted_tables
+    ])).one()
+    return all(oid is not None for oid in row)
+
+
+@with_app
 def init_database():
     """Initialise la base de données"""
-    with app.app_context():
-        print("🔄 Création des tables...")
-        try:
+    print("🔄 Création des tables...")
+    try:
+        # create_all() inspecte chaque table : inutile si le schéma est déjà là
+        if schema_exists():
+            print("ℹ️  Les tables existent déjà")
+        else:
             db.create_all()
             print("✅ Tables créées avec succès")
+    except Exception as e:
+        print(f"❌ Erreur lors de la création des tables : {e}")
+        return False
+        
+    # Vérifier si un admin existe déjà (requête construite une seule fois, voir ADMIN_EXISTS)
+    admin_exists = db.session.execute(ADMIN_EXISTS).first() is not None
+        
+    if not admin_exists:
+        print("\n👤 Création de l'utilisateur administrateur...")
+        try:
+            admin = User(
+                username=ADMIN_USER['username'],
+                email=ADMIN_USER['email'],
+                role=ADMIN_USER['role']
+            )
+            admin.set_password(ADMIN_USER['password'])
+            db.session.add(admin)
+            db.session.commit()
+            print("✅ Administrateur créé avec succès")
+            show_admin_credentials()
         except Exception as e:
-            print(f"❌ Erreur lors de la création des tables : {e}")
+            print(f"❌ Erreur lors de la création de l'admin : {e}")
             return False
+    else:
+        print("ℹ️  Un administrateur existe déjà")
         
-        # Vérifier si un admin existe déjà
-        admin = User.query.filter_by(role='admin').first()
-        
-        if not admin:
-            print("\n👤 Création de l'utilisateur administrateur...")
-            try:
-                admin = User(
-                    username='admin',
-                    email='admin@fraud-detection.com',
-                    role='admin'
-                )
-                admin.set_password('admin123')
-                db.session.add(admin)
-                db.session.commit()
-                print("✅ Administrateur créé avec succès")
-                print("\n" + "="*50)
-                print("   IDENTIFIANTS ADMINISTRATEUR")
-                print("="*50)
-                print("   Username: admin")
-                print("   Password: admin123")
-                print("="*50)
-                print("   ⚠️  IMPORTANT : Changez ce mot de passe !")
-                print("="*50)
-            except Exception as e:
-                print(f"❌ Erreur lors de la création de l'admin : {e}")
-                return False
+    return True
+
+
+def show_admin_credentials():
+    """Affiche les identifiants de l'administrateur par défaut"""
+    print("\n" + "="*50)
+    print("   IDENTIFIANTS ADMINISTRATEUR")
+    print("="*50)
+    print(f"   Username: {ADMIN_USER['username']}")
+    print(f"   Password: {ADMIN_USER['password']}")
+    print("="*50)
+    print("   ⚠️  IMPORTANT : Changez ce mot de passe !")
+    print("="*50)
+
+
+@with_app
+def user_rows(users):
+    """Lignes prêtes pour insert(User), mots de passe hachés en parallèle"""
+    # Chaque mot de passe distinct n'est haché qu'une fois : les comptes de test qui
+    # partagent un mot de passe partagent aussi son hash (données de test uniquement,
+    # User.set_password garde un sel par utilisateur)
+    passwords = list({u['password'] for u in users})
+    # hashlib libère le GIL pendant le calcul : les hachages s'exécutent en parallèle
+    with ThreadPoolExecutor() as executor:
+        hashed = dict(zip(passwords, executor.map(hash_password, passwords)))
+    created_at = datetime.utcnow()
+    return [
+        {
+            'username': u['username'],
+            'email': u['email'],
+            'role': u['role'],
+            'password_hash': hashed[u['password']],
+            'created_at': created_at
+        }
+        for u in users
+    ]
+
+
+def sample_users(count):
+    """Comptes de test, complétés par des comptes générés jusqu'à `count`"""
+    users = TEST_USERS[:count]
+    users += [
+        {'username': f'loaduser{i}', 'email': f'loaduser{i}@test.com', 'password': 'password123', 'role': 'user'}
+        for i in range(1, count - len(users) + 1)
+    ]
+    return users
+
+
+@with_app
+def insert_users(rows, batch_size=BATCH_SIZE, bulk=False):
+    """Insère les lignes par paquets de `batch_size` (execute_values/COPY avec psycopg2, pipeline/COPY avec psycopg)"""
+    if not rows:
+        return
+    driver = db.engine.dialect.driver
+    if driver not in ('psycopg2', 'psycopg'):
+        db.session.execute(insert(User), rows)
+        return
+    
+    # Curseur brut sur la connexion de la session : même transaction, sans l'ORM
+    table = db.engine.dialect.identifier_preparer.format_table(User.__table__)
+    columns = ('username', 'email', 'role', 'password_hash', 'created_at')
+    values = [tuple(row[c] for c in columns) for row in rows]
+    raw_connection = db.session.connection().connection.dbapi_connection
+    cursor = raw_connection.cursor()
+    
+    if driver == 'psycopg':
+        # psycopg 3 : COPY ligne à ligne, ou INSERT envoyés en mode pipeline (sans attendre chaque réponse)
+        if bulk:
+            with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for value in values:
+                    copy.write_row(value)
         else:
-            print("ℹ️  Un administrateur existe déjà")
-        
-        return True
+            with raw_connection.pipeline():
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columns))}) ON CONFLICT DO NOTHING",
+                    values
+                )
+        cursor.close()
+        return
+    
+    from psycopg2.extras import execute_values
+    
+    if bulk:
+        # COPY FROM STDIN : chargement en flux, sans passer par le parseur SQL
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(values)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        execute_values(
+            cursor,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s ON CONFLICT DO NOTHING",
+            values,
+            page_size=batch_size
+        )
+    cursor.close()
 
 
-def create_sample_users():
+@with_app
+def existing_usernames(usernames, batch_size=BATCH_SIZE):
+    """Noms déjà pris parmi `usernames`"""
+    if db.engine.dialect.name == 'postgresql':
+        # Un seul paramètre tableau (= ANY) quel que soit le nombre de noms
+        names = bindparam('names', usernames, type_=ARRAY(String))
+        return set(db.session.scalars(select(User.username).where(User.username == any_(names))))
+    
+    existing = set()
+    for start in range(0, len(usernames), batch_size):
+        existing.update(db.session.scalars(
+            select(User.username).where(User.username.in_(usernames[start:start + batch_size]))
+        ))
+    return existing
+
+
+@with_app
+def create_sample_users(count=len(TEST_USERS), batch_size=BATCH_SIZE, bulk=False):
     """Crée des utilisateurs de test"""
-    with app.app_context():
-        test_users = [
-            {'username': 'user1', 'email': 'user1@test.com', 'password': 'password123'},
-            {'username': 'user2', 'email': 'user2@test.com', 'password': 'password123'},
-            {'username': 'analyst', 'email': 'analyst@test.com', 'password': 'password123'},
-        ]
-        
-        print("\n👥 Création des utilisateurs de test...")
-        
-        created_count = 0
-        for user_data in test_users:
-            try:
-                if not User.query.filter_by(username=user_data['username']).first():
-                    user = User(
-                        username=user_data['username'],
-                        email=user_data['email'],
-                        role='user'
-                    )
-                    user.set_password(user_data['password'])
-                    db.session.add(user)
-                    print(f"   ✅ {user_data['username']} créé")
-                    created_count += 1
-                else:
-                    print(f"   ⚠️  {user_data['username']} existe déjà")
-            except Exception as e:
-                print(f"   ❌ Erreur pour {user_data['username']}: {e}")
-        
-        try:
-            db.session.commit()
-            print(f"\n✅ {created_count} utilisateur(s) de test créé(s)")
-        except Exception as e:
-            print(f"❌ Erreur lors de la validation : {e}")
-            db.session.rollback()
+    print("\n👥 Création des utilisateurs de test...")
+    
+    users = sample_users(count)
+    
+    # Comptes déjà présents, sans dépasser la limite de paramètres du driver
+    usernames = [u['username'] for u in users]
+    existing = existing_usernames(usernames, batch_size)
+    if len(existing) <= MAX_LISTED:
+        for username in usernames:
+            if username in existing:
+                print(f"   ⚠️  {username} existe déjà")
+    else:
+        print(f"   ⚠️  {len(existing)} utilisateurs existent déjà")
+    
+    rows = user_rows([u for u in users if u['username'] not in existing])
+    
+    try:
+        # INSERT multi-lignes, par paquets pour les gros volumes
+        insert_users(rows, batch_size, bulk)
+        db.session.commit()
+        if len(rows) <= MAX_LISTED:
+            for row in rows:
+                print(f"   ✅ {row['username']} créé")
+        print(f"\n✅ {len(rows)} utilisateur(s) de test créé(s)")
+    except Exception as e:
+        print(f"❌ Erreur lors de la validation : {e}")
+        db.session.rollback()
+
+
+@with_app
+def seed_all_users():
+    """Crée l'administrateur et les utilisateurs de test en une seule transaction"""
+    rows = user_rows([ADMIN_USER] + TEST_USERS)
+    try:
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+    except Exception as e:
+        print(f"❌ Erreur lors de la création des utilisateurs : {e}")
+        db.session.rollback()
+        return False
+    
+    for row in rows:
+        print(f"   ✅ {row['username']} créé")
+    show_admin_credentials()
+    return True
+
+
+@with_app
+def truncate_tables():
+    """Vide toutes les tables en conservant le schéma"""
+    tables = db.metadata.sorted_tables
+    if db.engine.dialect.name == 'postgresql':
+        # Une seule instruction, sans DDL ni recréation des index et séquences
+        preparer = db.engine.dialect.identifier_preparer
+        names = ', '.join(preparer.format_table(table) for table in tables)
+        db.session.execute(text(f"TRUNCATE TABLE {names} RESTART IDENTITY CASCADE"))
+    else:
+        for table in reversed(tables):
+            db.session.execute(table.delete())
+    db.session.commit()
 
 
-def reset_database():
+@with_app
+def reset_database(hard=False):
     """Réinitialise complètement la base de données"""
-    with app.app_context():
-        print("\n" + "="*60)
-        print("   ⚠️  ATTENTION : RÉINITIALISATION COMPLÈTE")
-        print("="*60)
-        print("   Cette action va supprimer TOUTES les données :")
-        print("   - Tous les utilisateurs")
-        print("   - Toutes les transactions")
-        print("   - TOUT sera perdu définitivement !")
-        print("="*60)
+    print("\n" + "="*60)
+    print("   ⚠️  ATTENTION : RÉINITIALISATION COMPLÈTE")
+    print("="*60)
+    print("   Cette action va supprimer TOUTES les données :")
+    print("   - Tous les utilisateurs")
+    print("   - Toutes les transactions")
+    print("   - TOUT sera perdu définitivement !")
+    print("="*60)
         
-        response = input("\nÊtes-vous ABSOLUMENT sûr ? (tapez 'OUI' en majuscules) : ")
+    response = input("\nÊtes-vous ABSOLUMENT sûr ? (tapez 'OUI' en majuscules) : ")
         
-        if response == 'OUI':
-            try:
+    if response == 'OUI':
+        try:
+            if hard:
                 print("\n🔄 Suppression de toutes les tables...")
                 db.drop_all()
                 print("✅ Tables supprimées")
-                
                 print("\n🔄 Recréation des tables...")
-                if init_database():
-                    print("\n🔄 Création des utilisateurs de test...")
-                    create_sample_users()
-                    print("\n✅ Base de données réinitialisée avec succès")
-                else:
-                    print("\n❌ Échec de la réinitialisation")
-            except Exception as e:
-                print(f"\n❌ Erreur lors de la réinitialisation : {e}")
-        else:
-            print("❌ Opération annulée (vous deviez taper 'OUI' en majuscules)")
+                db.create_all()
+                print("✅ Tables créées avec succès")
+            else:
+                # Base neuve (ou incomplète) : créer les tables manquantes avant de les vider
+                if not schema_exists():
+                    db.create_all()
+                print("\n🔄 Vidage de toutes les tables...")
+                truncate_tables()
+                print("✅ Tables vidées")
+                
+            print("\n👥 Création de l'administrateur et des utilisateurs de test...")
+            if seed_all_users():
+                print("\n✅ Base de données réinitialisée avec succès")
+            else:
+                print("\n❌ Échec de la réinitialisation")
+        except Exception as e:
+            print(f"\n❌ Erreur lors de la réinitialisation : {e}")
+    else:
+        print("❌ Opération annulée (vous deviez taper 'OUI' en majuscules)")
 
 
+@with_app
 def show_stats():
     """Affiche les statistiques de la base de données"""
-    with app.app_context():
-        from app import Transaction
+    from app import Transaction
         
-        try:
-            users_count = User.query.count()
-            transactions_count = Transaction.query.count()
-            frauds_count = Transaction.query.filter_by(fraud_prediction=1).count()
-            admins_count = User.query.filter_by(role='admin').count()
-            
-            print("\n" + "="*60)
-            print("   📊 STATISTIQUES DE LA BASE DE DONNÉES")
-            print("="*60)
-            print(f"   👥 Utilisateurs         : {users_count}")
-            print(f"      - Administrateurs    : {admins_count}")
-            print(f"      - Utilisateurs normaux: {users_count - admins_count}")
-            print(f"\n   💳 Transactions         : {transactions_count}")
+    try:
+        # Les compteurs et le taux de fraude (calculé par la base) en un seul aller-retour
+        frauds = func.sum(case((Transaction.fraud_prediction == 1, 1), else_=0))
+        users_count, admins_count, transactions_count, frauds_count, fraud_rate = db.session.execute(select(
+            select(func.count(User.id)).scalar_subquery(),
+            select(func.count(User.id)).where(User.role == 'admin').scalar_subquery(),
+            select(func.count(Transaction.id)).scalar_subquery(),
+            select(func.count(Transaction.id)).where(Transaction.fraud_prediction == 1).scalar_subquery(),
+            # 100.0 écrit tel quel dans le SQL : littéral NUMERIC quel que soit le driver,
+            # pour que round(numeric, integer) existe côté PostgreSQL
+            select(func.round(
+                literal_column('100.0', Numeric) * frauds / func.nullif(func.count(Transaction.id), 0), 1
+            )).scalar_subquery()
+        )).one()
+        
+        # Sortie construite en mémoire puis écrite en une seule fois
+        lines = [
+            "",
+            "="*60,
+            "   📊 STATISTIQUES DE LA BASE DE DONNÉES",
+            "="*60,
+            f"   👥 Utilisateurs         : {users_count}",
+            f"      - Administrateurs    : {admins_count}",
+            f"      - Utilisateurs normaux: {users_count - admins_count}",
+            "",
+            f"   💳 Transactions         : {transactions_count}",
+        ]
             
-            if transactions_count > 0:
-                print(f"      - Fraudes détectées  : {frauds_count}")
-                print(f"      - Légitimes          : {transactions_count - frauds_count}")
-                fraud_rate = (frauds_count / transactions_count) * 100
-                print(f"      - Taux de fraude     : {fraud_rate:.1f}%")
+        if transactions_count > 0:
+            lines.append(f"      - Fraudes détectées  : {frauds_count}")
+            lines.append(f"      - Légitimes          : {transactions_count - frauds_count}")
+            lines.append(f"      - Taux de fraude     : {fraud_rate}%")
             
-            print("="*60)
+        lines.append("="*60)
             
-            # Détails sur les utilisateurs
-            if users_count > 0:
-                print("\n   📋 Liste des utilisateurs :")
-                users = User.query.all()
-                for user in users:
-                    user_transactions = Transaction.query.filter_by(user_id=user.id).count()
-                    role_icon = "👑" if user.role == 'admin' else "👤"
-                    print(f"      {role_icon} {user.username} ({user.email}) - {user_transactions} transactions")
+        # Détails sur les utilisateurs
+        if users_count > 0:
+            lines.append("")
+            lines.append("   📋 Liste des utilisateurs :")
+            # Nombre de transactions par utilisateur en une seule requête
+            rows = db.session.execute(
+                select(User.username, User.email, User.role, func.count(Transaction.id))
+                .select_from(User)
+                .outerjoin(Transaction, Transaction.user_id == User.id)
+                .group_by(User.id)
+                .order_by(User.id)
+            ).all()
+            for username, email, role, user_transactions in rows:
+                role_icon = "👑" if role == 'admin' else "👤"
+                lines.append(f"      {role_icon} {username} ({email}) - {user_transactions} transactions")
             
-            print("\n" + "="*60)
+        lines.append("")
+        lines.append("="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
             
-        except Exception as e:
-            print(f"\n❌ Erreur lors de la récupération des stats : {e}")
+    except Exception as e:
+        print(f"\n❌ Erreur lors de la récupération des stats : {e}")
 
 
 def check_connection():
     """Vérifie la connexion à la base de données"""
+    if _conn_checked:
+        return True
+    
     print("\n🔍 Vérification de la connexion...")
     
-    # Vérifier que DATABASE_URI est défini
+    # Vérifier que DATABASE_URI est défini (sans importer l'application, qui en a besoin)
     database_uri = os.getenv('DATABASE_URI')
     if not database_uri:
         print("❌ ERREUR : DATABASE_URI n'est pas défini")
@@ -185,23 +429,44 @@ def check_connection():
     print(f"✅ DATABASE_URI trouvé")
     print(f"   Connexion : {database_uri.split('@')[1] if '@' in database_uri else 'format invalide'}")
     
-    # Tester la connexion
-    with app.app_context():
-        try:
-            # Essayer une requête simple
-            from sqlalchemy import text
-            result = db.session.execute(text('SELECT 1'))
-            print("✅ Connexion à la base de données réussie")
-            return True
-        except Exception as e:
-            print(f"❌ Échec de connexion à la base de données")
-            print(f"   Erreur : {e}")
-            print("\n📋 Vérifications à faire :")
-            print("   1. PostgreSQL est-il démarré ?")
-            print("   2. La base de données existe-t-elle ?")
-            print("   3. L'utilisateur a-t-il les bons privilèges ?")
-            print("   4. Les identifiants dans .env sont-ils corrects ?")
-            return False
+    return ping_database()
+
+
+@with_app
+def ping_database():
+    """Teste la connexion avec une requête simple"""
+    global _conn_checked
+    try:
+        # Essayer une requête simple, directement sur le driver (sans session ORM)
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+        _conn_checked = True
+        print("✅ Connexion à la base de données réussie")
+        return True
+    except Exception as e:
+        print(f"❌ Échec de connexion à la base de données")
+        print(f"   Erreur : {e}")
+        print("\n📋 Vérifications à faire :")
+        print("   1. PostgreSQL est-il démarré ?")
+        print("   2. La base de données existe-t-elle ?")
+        print("   3. L'utilisateur a-t-il les bons privilèges ?")
+        print("   4. Les identifiants dans .env sont-ils corrects ?")
+        return False
+
+
+def create_users_args(args):
+    """Nombre d'utilisateurs, taille de paquet et mode COPY pour create-users"""
+    count = int(args[0]) if args and args[0].isdigit() else len(TEST_USERS)
+    batch_size = BATCH_SIZE
+    if '--batch-size' in args:
+        position = args.index('--batch-size') + 1
+        value = args[position] if position < len(args) else ''
+        if not value.isdigit() or int(value) == 0:
+            print(f"\n❌ --batch-size attend un entier positif (reçu : '{value}')")
+            show_help()
+            sys.exit(1)
+        batch_size = int(value)
+    return count, batch_size, '--bulk' in args
 
 
 def show_help():
@@ -214,14 +479,17 @@ def show_help():
     print("                   • Crée les tables")
     print("                   • Crée l'utilisateur admin")
     print("\n   reset         - Réinitialise complètement la BDD")
-    print("                   • Supprime tout")
-    print("                   • Recrée les tables")
+    print("                   • Vide toutes les tables (TRUNCATE)")
     print("                   • Recrée admin et users de test")
+    print("                   • --hard : supprime et recrée les tables")
     print("                   ⚠️  ATTENTION : Perte de données !")
     print("\n   create-users  - Crée des utilisateurs de test")
     print("                   • user1 / password123")
     print("                   • user2 / password123")
     print("                   • analyst / password123")
+    print("                   • [N] : complète avec loaduser1..N (test de charge)")
+    print("                   • --batch-size B : taille des paquets d'INSERT (psycopg2 sans --bulk)")
+    print("                   • --bulk : chargement via COPY (PostgreSQL, psycopg2 ou psycopg)")
     print("\n   stats         - Affiche les statistiques")
     print("                   • Nombre d'utilisateurs")
     print("                   • Nombre de transactions")
@@ -235,7 +503,10 @@ def show_help():
     print("\n   python init_db.py init")
     print("   python init_db.py stats")
     print("   python init_db.py create-users")
+    print("   python init_db.py create-users 10000 --batch-size 5000")
+    print("   python init_db.py create-users 100000 --bulk")
     print("   python init_db.py check")
+    print("   python init_db.py reset --hard")
     print("\n" + "="*60)
 
 
@@ -251,41 +522,50 @@ if __name__ == '__main__':
     
     command = sys.argv[1]
     
-    if command == 'init':
-        print("\n📦 Initialisation de la base de données...")
-        if check_connection():
-            if init_database():
-                print("\n✅ Initialisation terminée avec succès !")
-                print("\n💡 Prochaine étape : python app.py")
-            else:
-                print("\n❌ Échec de l'initialisation")
-                sys.exit(1)
-        else:
-            sys.exit(1)
+    if command == 'help' or command == '--help' or command == '-h':
+        show_help()
+        sys.exit(0)
     
-    elif command == 'reset':
-        if check_connection():
-            reset_database()
+    if command not in DB_COMMANDS:
+        print(f"\n❌ Commande inconnue : '{command}'")
+        show_help()
+        sys.exit(1)
     
-    elif command == 'create-users':
-        if check_connection():
-            create_sample_users()
+    # Sans DATABASE_URI, app.py ne peut pas être importé : message explicite avant _load_app()
+    if not os.getenv('DATABASE_URI'):
+        check_connection()
+        sys.exit(1)
     
-    elif command == 'stats':
-        if check_connection():
-            show_stats()
+    # Un seul contexte applicatif pour toute la commande
+    with _load_app().app_context():
+        if command == 'init':
+            print("\n📦 Initialisation de la base de données...")
+            if check_connection():
+                if init_database():
+                    print("\n✅ Initialisation terminée avec succès !")
+                    print("\n💡 Prochaine étape : python app.py")
+                else:
+                    print("\n❌ Échec de l'initialisation")
+                    sys.exit(1)
+            else:
+                sys.exit(1)
     
-    elif command == 'check':
-        if check_connection():
-            print("\n✅ Tout est OK ! Vous pouvez lancer l'application.")
-        else:
-            print("\n⚠️  Résolvez les problèmes avant de continuer.")
-            sys.exit(1)
+        elif command == 'reset':
+            if check_connection():
+                reset_database(hard='--hard' in sys.argv[2:])
     
-    elif command == 'help' or command == '--help' or command == '-h':
-        show_help()
+        elif command == 'create-users':
+            options = create_users_args(sys.argv[2:])
+            if check_connection():
+                create_sample_users(*options)
     
-    else:
-        print(f"\n❌ Commande inconnue : '{command}'")
-        show_help()
-        sys.exit(1)
\ No newline at end of file
+        elif command == 'stats':
+            if check_connection():
+                show_stats()
+    
+        elif command == 'check':
+            if check_connection():
+                print("\n✅ Tout est OK ! Vous pouvez lancer l'application.")
+            else:
+                print("\n⚠️  Résolvez les problèmes avant de continuer.")
+                sys.exit(1)
\ No newline at end of file